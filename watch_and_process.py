@@ -4,7 +4,7 @@
 # - watches Downloads (or a user-selected folder)
 # - only processes files whose names start with "ETSA-TSA-" and end with ".xls"
 # - file must be no older than 12 hours
-# - converts .xls -> .xlsx (Excel COM) if needed
+# - converts .xls -> .xlsx (Excel COM, or headless LibreOffice if Excel is absent) if needed
 # - transforms Column B (from row 19) by appending " ### <url>" once
 # - copies processed file into a user-selected SharePoint synced folder (OneDrive uploads)
 #
@@ -20,22 +20,29 @@
 # Author: "Process SR Report" build
 # Date: Jan 2026
 
-import os, re, sys, time, json, shutil, logging
+import os, re, sys, time, json, shutil, logging, zipfile, posixpath, ctypes, threading, fnmatch
+import atexit, queue, subprocess
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+import xml.etree.ElementTree as ET
+from html import unescape
+from xml.sax.saxutils import escape
 from pathlib import Path
 from datetime import datetime, timedelta
 
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from watchdog.events import PatternMatchingEventHandler
 
 try:
-    import win32com.client as win32  # Excel COM
-except Exception:
-    win32 = None
+    import orjson
+except ImportError:
+    orjson = None
 
-from openpyxl import load_workbook
-
-import tkinter as tk
-from tkinter import messagebox, filedialog
+# win32com, openpyxl and tkinter are imported where they are first needed:
+# a normal start (settings present, no .xls yet) never pays for them.
+win32 = None
+_win32_checked = False
 
 APP_DISPLAY_NAME = "Process SR Report"
 APP_DIR_NAME     = "ProcessSRReport"  # for %APPDATA% folder and log
@@ -45,6 +52,58 @@ DEFAULT_COL_B      = 2
 DEFAULT_SEPARATOR  = " ### "
 DEFAULT_TS_FMT     = "%Y%m%d_%H%M%S"
 MAX_FILE_AGE_HOURS = 12
+DEBOUNCE_SECS      = 0.5  # quiet window before a burst of events is handled
+DEBOUNCE_MAX_SECS  = 5    # ...but never hold a continuously-touched file longer
+EXCEL_IDLE_SECS    = 600  # quit the pooled Excel instance after this long unused
+IDLE_SUSPEND_SECS  = 600  # drop the OS watch after this long without a report...
+IDLE_POLL_SECS     = 60   # ...and look for new ones with a cheap scandir instead
+PROCESSED_CACHE_SIZE = 256  # (path, size, mtime) fingerprints remembered across runs
+SOFFICE_TIMEOUT_SECS = 120
+
+# OOXML namespaces used when peeking inside .xlsx packages
+NS_MAIN    = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+NS_DOC_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+_URL_RE    = re.compile(r"https?://\S+", re.IGNORECASE)
+_HL_PREFIX = "=hyperlink("
+# one HYPERLINK() argument plus its trailing separator: a "quoted" string
+# ("" escapes a quote) or a bare token
+_HL_ARG_RE = re.compile(r'\s*(?:"((?:[^"]|"")*)"|([^,;]*?))\s*(?:[,;]|$)')
+
+# inotify reports IN_CLOSE_WRITE as on_closed, which already means "writer done"
+CLOSE_EVENTS = sys.platform.startswith("linux")
+
+if os.name == "nt":
+    from ctypes import wintypes
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.CreateFileW.restype = wintypes.HANDLE
+    _kernel32.CreateFileW.argtypes = [wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD,
+                                      wintypes.LPVOID, wintypes.DWORD, wintypes.DWORD,
+                                      wintypes.HANDLE]
+    _kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    _kernel32.CopyFileExW.restype = wintypes.BOOL
+    _kernel32.CopyFileExW.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.LPVOID,
+                                      wintypes.LPVOID, wintypes.LPBOOL, wintypes.DWORD]
+    GENERIC_READ            = 0x80000000
+    FILE_SHARE_READ         = 0x00000001
+    OPEN_EXISTING           = 3
+    ERROR_SHARING_VIOLATION = 32
+    INVALID_HANDLE_VALUE    = wintypes.HANDLE(-1).value
+    COPY_FILE_NO_BUFFERING  = 0x00001000
+
+UNBUFFERED_COPY_MIN = 1024 * 1024  # bypass the page cache for copies above this
+
+
+def _get_win32():
+    global win32, _win32_checked
+    if not _win32_checked:
+        try:
+            import win32com.client as win32  # Excel COM
+        except Exception:
+            win32 = None
+        _win32_checked = True
+    return win32
 
 
 def get_appdata_dir() -> Path:
@@ -55,27 +114,54 @@ def get_appdata_dir() -> Path:
 
 SETTINGS_PATH = get_appdata_dir() / "settings.json"
 LOG_PATH      = get_appdata_dir() / "bot.log"
+PROCESSED_PATH = get_appdata_dir() / "processed.json"
+
+
+def read_json(path: Path):
+    data = path.read_bytes()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def write_json(path: Path, obj):
+    if orjson:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(obj, indent=2), encoding="utf-8")
 
 
 def load_settings():
     if SETTINGS_PATH.exists():
         try:
-            return json.loads(SETTINGS_PATH.read_text(encoding="utf-8"))
+            return read_json(SETTINGS_PATH)
         except Exception:
             pass
     return {}
 
 
 def save_settings(obj: dict):
-    SETTINGS_PATH.write_text(json.dumps(obj, indent=2), encoding="utf-8")
+    write_json(SETTINGS_PATH, obj)
 
 
 def default_downloads():
     return str(Path.home() / "Downloads")
 
 
+_tk_root = None
+
+
+def _get_root():
+    # One hidden root shared by every wizard dialog
+    global _tk_root
+    if _tk_root is None:
+        import tkinter as tk
+        _tk_root = tk.Tk(); _tk_root.withdraw()
+        atexit.register(lambda: _tk_root and _tk_root.destroy())
+    return _tk_root
+
+
 def prompt_explain_and_pick_sharepoint():
-    root = tk.Tk(); root.withdraw()
+    from tkinter import messagebox, filedialog
+    _get_root()
     message = (
         "Select your local SharePoint library folder.\n\n"
         "Important: The library must be synced to your PC via OneDrive first.\n"
@@ -91,7 +177,8 @@ def prompt_explain_and_pick_sharepoint():
 
 
 def prompt_optional_watch_folder(default_dl):
-    root = tk.Tk(); root.withdraw()
+    from tkinter import messagebox, filedialog
+    _get_root()
     if messagebox.askyesno(
         f"{APP_DISPLAY_NAME} — Watch folder",
         f"Default watch folder is your Downloads:\n\n{default_dl}\n\n"
@@ -111,7 +198,8 @@ def ensure_config(reset=False):
     if not cfg.get("sharepoint_folder") or not Path(cfg["sharepoint_folder"]).exists():
         sp = prompt_explain_and_pick_sharepoint()
         if not Path(sp).exists():
-            tk.messagebox.showerror("Invalid folder", "That path does not exist. Exiting.")
+            from tkinter import messagebox
+            messagebox.showerror("Invalid folder", "That path does not exist. Exiting.")
             sys.exit(1)
         cfg["sharepoint_folder"] = sp
         changed = True
@@ -120,7 +208,8 @@ def ensure_config(reset=False):
         dl = default_downloads()
         wf = prompt_optional_watch_folder(dl)
         if not Path(wf).exists():
-            tk.messagebox.showerror("Invalid folder", "That path does not exist. Exiting.")
+            from tkinter import messagebox
+            messagebox.showerror("Invalid folder", "That path does not exist. Exiting.")
             sys.exit(1)
         cfg["watch_folder"] = wf
         changed = True
@@ -154,7 +243,30 @@ def setup_logging():
     logging.info(f"{APP_DISPLAY_NAME} started. Log: {LOG_PATH}")
 
 
+def _writer_released(p: Path, timeout=120) -> bool:
+    # Opening with FILE_SHARE_READ only fails with a sharing violation for as
+    # long as the producer (browser/Excel) still holds a write handle.
+    delay = 0.05
+    deadline = time.monotonic() + timeout
+    while True:
+        h = _kernel32.CreateFileW(str(p), GENERIC_READ, FILE_SHARE_READ, None,
+                                  OPEN_EXISTING, 0, None)
+        if h != INVALID_HANDLE_VALUE:
+            _kernel32.CloseHandle(h)
+            return p.stat().st_size > 0
+        if ctypes.get_last_error() != ERROR_SHARING_VIOLATION:
+            return False
+        if time.monotonic() + delay > deadline:
+            return False
+        time.sleep(delay)
+        delay = min(delay * 2, 2.0)
+
+
 def is_file_stable(p: Path, stable_secs=5) -> bool:
+    if stable_secs <= 0:
+        return p.exists() and p.stat().st_size > 0
+    if os.name == "nt":
+        return _writer_released(p)
     last = -1; same = 0
     while same < stable_secs:
         if not p.exists():
@@ -177,139 +289,711 @@ def is_file_fresh_enough(p: Path, max_hours=12) -> bool:
     return age <= timedelta(hours=max_hours)
 
 
-def excel_xls_to_xlsx(src_xls: Path, visible=False) -> Path:
-    if win32 is None:
+class _ExcelPool:
+    # One hidden Excel instance reused across conversions instead of a cold
+    # start + Quit() per file. COM objects belong to the thread that created
+    # them, so Excel lives on its own worker thread and jobs are queued to it.
+
+    def __init__(self, idle_secs=EXCEL_IDLE_SECS):
+        self.idle_secs = idle_secs
+        self._jobs = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def run(self, fn, *args):
+        """Call fn(excel, *args) on the Excel thread and return its result."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="excel", daemon=True)
+                self._thread.start()
+        done = Future()
+        self._jobs.put((fn, args, done))
+        return done.result()
+
+    def close(self):
+        with self._lock:
+            t, self._thread = self._thread, None
+        if t is not None and t.is_alive():
+            self._jobs.put(None)
+            t.join(timeout=30)
+
+    @staticmethod
+    def _start():
+        # DispatchEx always starts a private instance; EnsureDispatch("Excel.Application")
+        # could attach to the user's open Excel, which _quit would then close
+        excel = win32.gencache.EnsureDispatch(win32.DispatchEx("Excel.Application"))
+        excel.Visible = False
+        excel.DisplayAlerts = False
+        excel.ScreenUpdating = False
+        excel.EnableEvents = False
+        return excel
+
+    @staticmethod
+    def _alive(excel):
+        try:
+            excel.Workbooks.Count
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(excel):
+        if excel is not None:
+            try:
+                excel.Quit()
+            except Exception:
+                pass
+        return None
+
+    def _worker(self):
+        import pythoncom
+        pythoncom.CoInitialize()
+        excel = None
+        try:
+            while True:
+                try:
+                    job = self._jobs.get(timeout=self.idle_secs if excel else None)
+                except queue.Empty:
+                    logging.info("Excel idle; closing it until the next .xls arrives.")
+                    excel = self._quit(excel)
+                    continue
+                if job is None:
+                    break
+                fn, args, done = job
+                if not done.set_running_or_notify_cancel():
+                    continue
+                try:
+                    if excel is not None and not self._alive(excel):
+                        excel = None
+                    if excel is None:
+                        excel = self._start()
+                    done.set_result(fn(excel, *args))
+                except Exception as e:
+                    # don't keep reusing an instance that may have died mid-call
+                    excel = self._quit(excel)
+                    done.set_exception(e)
+        finally:
+            self._quit(excel)
+            pythoncom.CoUninitialize()
+
+
+_excel_pool = _ExcelPool()
+atexit.register(_excel_pool.close)
+
+
+def excel_xls_to_xlsx_batch(paths, visible=False) -> list:
+    # Open/SaveAs/Close every file inside one pooled Excel job. The result is
+    # aligned with `paths`; files Excel could not convert come back as None.
+    if _get_win32() is None:
         raise RuntimeError("Excel automation not available (pywin32 not installed).")
-    excel = win32.gencache.EnsureDispatch("Excel.Application")
-    excel.Visible = bool(visible)
-    wb = excel.Workbooks.Open(str(src_xls))
-    dst = src_xls.with_suffix(".xlsx")
-    wb.SaveAs(str(dst), FileFormat=51)  # 51 = xlOpenXMLWorkbook (.xlsx)
-    wb.Close(SaveChanges=False)
-    excel.Application.Quit()
-    return dst
+
+    def convert(excel):
+        excel.Visible = bool(visible)
+        out = []
+        for src_xls in paths:
+            dst = src_xls.with_suffix(".xlsx")
+            try:
+                wb = excel.Workbooks.Open(str(src_xls))
+                try:
+                    wb.SaveAs(str(dst), FileFormat=51)  # 51 = xlOpenXMLWorkbook (.xlsx)
+                finally:
+                    wb.Close(SaveChanges=False)
+                out.append(dst)
+            except Exception as e:
+                logging.exception(f"Excel could not convert {src_xls}: {e}")
+                out.append(None)
+        return out
+
+    return _excel_pool.run(convert)
+
+
+def _find_soffice():
+    found = shutil.which("soffice")
+    if found:
+        return found
+    for base in (os.getenv("PROGRAMFILES"), os.getenv("PROGRAMFILES(X86)")):
+        if base:
+            exe = Path(base) / "LibreOffice" / "program" / "soffice.exe"
+            if exe.exists():
+                return str(exe)
+    return None
+
+
+def libreoffice_batch_convert(paths: list, outdir: Path) -> list:
+    # Fallback when Excel isn't installed: one headless soffice process
+    # converts the whole batch. Result is aligned with `paths` (None = failed).
+    soffice = _find_soffice()
+    if soffice is None:
+        raise RuntimeError("LibreOffice (soffice) not found.")
+    # private profile so a LibreOffice window the user has open can't swallow the job
+    profile = (get_appdata_dir() / "soffice_profile").as_uri()
+    started = time.time()
+    proc = subprocess.run(
+        [soffice, f"-env:UserInstallation={profile}", "--headless", "--norestore",
+         "--convert-to", "xlsx", "--outdir", str(outdir), *map(str, paths)],
+        capture_output=True, text=True, timeout=SOFFICE_TIMEOUT_SECS)
+    if proc.returncode != 0:
+        logging.warning(f"soffice exited with {proc.returncode}: {proc.stderr.strip()}")
+    out = []
+    for src in paths:
+        dst = outdir / (src.stem + ".xlsx")
+        if dst.exists() and dst.stat().st_mtime >= started - 1:
+            out.append(dst)
+        else:
+            logging.error(f"LibreOffice could not convert {src}")
+            out.append(None)
+    return out
 
 
 def parse_hyperlink_formula(formula: str):
     s = formula.strip()
-    if not s.upper().startswith("=HYPERLINK("):
+    if s[:11].lower() != _HL_PREFIX:
         return None, None
     inside = s[s.find("(")+1:].rstrip(")")
-    inq = False; buf = ""; parts = []
-    for ch in inside:
-        if ch == '"':
-            inq = not inq; buf += ch; continue
-        if not inq and ch in ",;":
-            parts.append(buf.strip()); buf = ""; continue
-        buf += ch
-    if buf: parts.append(buf.strip())
-    def clean(t): return t[1:-1] if t.startswith('"') and t.endswith('"') else t
-    url = clean(parts[0]) if parts else ""
-    text = clean(parts[1]) if len(parts) > 1 else ""
+    parts = [q.replace('""', '"') if q is not None else bare.strip()
+             for q, bare in (m.groups() for m in _HL_ARG_RE.finditer(inside))]
+    url = parts[0] if parts else ""
+    text = parts[1] if len(parts) > 1 else ""
     return url or None, text or None
 
 
-def transform_workbook(xlsx_path: Path, start_row=19, col_b=2, sep=" ### "):
+def _col_index(letters: str) -> int:
+    n = 0
+    for ch in letters.upper():
+        n = n * 26 + (ord(ch) - 64)
+    return n
+
+
+_REF_RE = re.compile(r"\$?([A-Za-z]{1,3})\$?(\d+)")
+
+
+def _ref_rows(ref: str, col: int):
+    # "B19" or "B19:C25" -> rows covered in column `col`
+    cells = _REF_RE.findall(ref or "")
+    if not cells:
+        return range(0)
+    (c1, r1), (c2, r2) = cells[0], cells[-1]
+    if not _col_index(c1) <= col <= _col_index(c2):
+        return range(0)
+    return range(int(r1), int(r2) + 1)
+
+
+def _read_rels(zf: zipfile.ZipFile, part: str) -> dict:
+    folder, name = posixpath.split(part)
+    try:
+        root = ET.fromstring(zf.read(posixpath.join(folder, "_rels", name + ".rels")))
+    except KeyError:
+        return {}
+    rels = {}
+    for rel in root.iter(f"{{{NS_PKG_REL}}}Relationship"):
+        target = rel.get("Target", "")
+        if rel.get("TargetMode") != "External":
+            if target.startswith("/"):
+                target = target.lstrip("/")
+            else:
+                target = posixpath.normpath(posixpath.join(folder, target))
+        rels[rel.get("Id")] = target
+    return rels
+
+
+def _first_sheet_part(zf: zipfile.ZipFile) -> str:
+    root = ET.fromstring(zf.read("xl/workbook.xml"))
+    sheet = root.find(f"{{{NS_MAIN}}}sheets/{{{NS_MAIN}}}sheet")
+    return _read_rels(zf, "xl/workbook.xml")[sheet.get(f"{{{NS_DOC_REL}}}id")]
+
+
+def _column_hyperlinks(zf: zipfile.ZipFile, part: str, col: int) -> dict:
+    # The sheet's <hyperlinks> resolved through its rels: {row: target}
+    links = {}
+    rels = _read_rels(zf, part)
+    if not rels:
+        return links
+    with zf.open(part) as src:
+        for _, el in ET.iterparse(src):
+            if el.tag == f"{{{NS_MAIN}}}hyperlink":
+                target = rels.get(el.get(f"{{{NS_DOC_REL}}}id"))
+                if target:
+                    for r in _ref_rows(el.get("ref"), col):
+                        links[r] = target
+            elif el.tag == f"{{{NS_MAIN}}}row":
+                el.clear()
+    return links
+
+
+def _shared_strings(zf: zipfile.ZipFile) -> list:
+    t_tag, r_tag = f"{{{NS_MAIN}}}t", f"{{{NS_MAIN}}}r"
+    strings = []
+    try:
+        src = zf.open("xl/sharedStrings.xml")
+    except KeyError:
+        return strings
+    with src:
+        for _, el in ET.iterparse(src):
+            if el.tag == f"{{{NS_MAIN}}}si":
+                # plain <t> or rich-text <r><t>; phonetic <rPh> runs are skipped
+                parts = []
+                for child in el:
+                    if child.tag == r_tag:
+                        child = child.find(t_tag)
+                    if child is not None and child.tag == t_tag:
+                        parts.append(child.text or "")
+                strings.append("".join(parts))
+                el.clear()
+    return strings
+
+
+_SCAN_CHUNK = 64 * 1024
+# http(s):// not inside an attribute value (xmlns="http://schemas...") or a
+# HYPERLINK( formula; matched against lowercased bytes
+_URL_BYTES_RE  = re.compile(rb'(?<!=")https?://|hyperlink\(')
+_HL_RELS_RE    = re.compile(rb"relationships/hyperlink")
+
+
+def _member_search(zf: zipfile.ZipFile, name: str, pattern) -> bool:
+    # Case-insensitive search of one zip member, streamed in 64KB chunks
+    tail = b""
+    try:
+        src = zf.open(name)
+    except KeyError:
+        return False
+    with src:
+        while True:
+            chunk = src.read(_SCAN_CHUNK)
+            if not chunk:
+                return False
+            buf = tail + chunk.lower()
+            if pattern.search(buf):
+                return True
+            tail = buf[-32:]
+
+
+def _fast_has_urls(xlsx_path: Path) -> bool:
+    # Peek into the package before paying for a full openpyxl load: a report
+    # with no hyperlink relationships, no http(s) text and no =HYPERLINK()
+    # formulas has nothing for transform_workbook to do.
+    try:
+        with zipfile.ZipFile(xlsx_path) as zf:
+            part = _first_sheet_part(zf)
+            folder, name = posixpath.split(part)
+            return (_member_search(zf, posixpath.join(folder, "_rels", name + ".rels"), _HL_RELS_RE)
+                    or _member_search(zf, "xl/sharedStrings.xml", _URL_BYTES_RE)
+                    or _member_search(zf, part, _URL_BYTES_RE))
+    except Exception:
+        return True  # let the full load surface whatever is wrong
+
+
+class _UnsupportedLayout(Exception):
+    pass
+
+
+_ATTR_RE = re.compile(r'([\w:]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+_F_RE    = re.compile(r"<(?:\w+:)?f(\s[^>]*?)?(?:/>|>(.*?)</(?:\w+:)?f>)", re.S)
+_V_RE    = re.compile(r"<(?:\w+:)?v(?:\s[^>]*?)?>(.*?)</(?:\w+:)?v>", re.S)
+_T_RE    = re.compile(r"<(?:\w+:)?t(?:\s[^>]*?)?(?<!/)>(.*?)</(?:\w+:)?t>", re.S)
+_CALC_CT_RE   = re.compile(rb'<Override[^>]*PartName="/xl/calcChain\.xml"[^>]*/>')
+_CALC_RELS_RE = re.compile(rb'<Relationship[^>]*Target="[^"]*calcChain\.xml"[^>]*/>')
+
+
+def _col_letter(col: int) -> str:
+    letters = ""
+    while col:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _cell_text(attrs: dict, body: str, strings: list):
+    # Same value openpyxl gives with data_only=False: "=..." for formulas
+    f = _F_RE.search(body)
+    if f is not None:
+        # shared/array formulas span other cells (a master's ref can reach past
+        # column B), so replacing just this one would orphan its dependents
+        f_attrs = {k: a or b for k, a, b in _ATTR_RE.findall(f.group(1) or "")}
+        kind = f_attrs.get("t", "normal")
+        if kind != "normal" or f.group(2) is None:
+            raise _UnsupportedLayout(f"{kind} formula in target column")
+        return "=" + unescape(f.group(2))
+    kind = attrs.get("t", "n")
+    if kind == "inlineStr":
+        return "".join(unescape(t) for t in _T_RE.findall(body))
+    v = _V_RE.search(body)
+    if v is None:
+        return None
+    raw = unescape(v.group(1))
+    return strings[int(raw)] if kind == "s" else raw
+
+
+def _rewrite_sheet_xml(xlsx_path: Path, dst_path: Path, start_row, col_b, sep):
+    # Only column B text changes, so splice new <c> elements into the first
+    # sheet's XML and pass every other part of the package through as-is.
+    # Untouched bytes stay byte-identical (no ElementTree re-serialisation,
+    # which would rename namespace prefixes that mc:Ignorable refers to).
+    letter = _col_letter(col_b)
+    cell_re = re.compile(
+        rf'<((?:\w+:)?)c\s(?=[^>]*?\br=["\']{letter}(\d+)["\'])([^>]*?)(?:/>|>(.*?)</\1c>)',
+        re.S)
+    changed = 0
+    formula_removed = False
+    with zipfile.ZipFile(xlsx_path) as zin:
+        try:
+            part = _first_sheet_part(zin)
+            xml = zin.read(part).decode("utf-8")
+        except (KeyError, AttributeError, UnicodeDecodeError) as e:
+            raise _UnsupportedLayout(f"unexpected package layout: {e!r}")
+        strings = _shared_strings(zin)
+        links = _column_hyperlinks(zin, part, col_b)
+
+        def rewrite(m):
+            nonlocal changed, formula_removed
+            pfx, row, attr_src, body = m.group(1), int(m.group(2)), m.group(3), m.group(4) or ""
+            if row < start_row:
+                return m.group(0)
+            attrs = {k: a or b for k, a, b in _ATTR_RE.findall(attr_src)}
+            val = _cell_text(attrs, body, strings)
+            if val is None and row not in links:
+                return m.group(0)
+            val, url = _link_text("" if val is None else val, links.get(row))
+            if not url or sep in val:
+                return m.group(0)
+            changed += 1
+            formula_removed = formula_removed or "<" + pfx + "f" in body
+            style = f' s="{attrs["s"]}"' if "s" in attrs else ""
+            return (f'<{pfx}c r="{letter}{row}"{style} t="inlineStr"><{pfx}is>'
+                    f'<{pfx}t xml:space="preserve">{escape(f"{val}{sep}{url}")}</{pfx}t>'
+                    f'</{pfx}is></{pfx}c>')
+
+        xml = cell_re.sub(rewrite, xml)
+        if not changed:
+            shutil.copyfile(xlsx_path, dst_path)
+            return 0
+
+        patched = {part: xml.encode("utf-8")}
+        dropped = set()
+        if formula_removed and "xl/calcChain.xml" in zin.NameToInfo:
+            # the calc chain would still point at the formulas we replaced
+            dropped.add("xl/calcChain.xml")
+            patched["[Content_Types].xml"] = _CALC_CT_RE.sub(b"", zin.read("[Content_Types].xml"))
+            patched["xl/_rels/workbook.xml.rels"] = _CALC_RELS_RE.sub(
+                b"", zin.read("xl/_rels/workbook.xml.rels"))
+
+        with zipfile.ZipFile(dst_path, "w", zipfile.ZIP_DEFLATED) as zout:
+            for info in zin.infolist():
+                if info.filename in dropped:
+                    continue
+                data = patched.get(info.filename)
+                zout.writestr(info, data if data is not None else zin.read(info))
+    return changed
+
+
+def _link_text(val: str, link=None):
+    # -> (display text, url) for a column-B value and its hyperlink target
+    url = link
+    if not url and val[:1] == "=":
+        u, t = parse_hyperlink_formula(val)
+        if u:
+            url = u
+            if t:
+                val = t
+    # "://" is a C-level substring test that rejects most plain-text rows
+    # before the regex runs (and, unlike "http", is case-insensitive safe)
+    if not url and "://" in val:
+        m = _URL_RE.search(val)
+        if m: url = m.group(0)
+    return val, url
+
+
+def _transform_with_openpyxl(xlsx_path: Path, dst_path: Path, start_row, col_b, sep):
+    # Full DOM load, so merged cells, column widths and other hyperlinks
+    # survive; only used for layouts the XML splice can't handle.
+    from openpyxl import load_workbook
     wb = load_workbook(filename=str(xlsx_path))
     ws = wb.worksheets[0]
-    max_row = ws.max_row
-    if max_row < start_row:
-        wb.save(str(xlsx_path))
-        return 0
     changed = 0
-    for r in range(start_row, max_row+1):
+    for r in range(start_row, ws.max_row + 1):
         cell = ws.cell(row=r, column=col_b)
-        val = "" if cell.value is None else str(cell.value)
-        url = None
-
-        if cell.hyperlink and getattr(cell.hyperlink, "target", None):
-            url = cell.hyperlink.target
-        elif isinstance(val, str) and val.startswith("="):
-            u, t = parse_hyperlink_formula(val)
-            if u:
-                url = u
-                if t:
-                    val = t
-        if not url and isinstance(val, str):
-            m = re.search(r"https?://\S+", val, re.IGNORECASE)
-            if m: url = m.group(0)
-
+        link = cell.hyperlink.target if cell.hyperlink else None
+        if cell.value is None and not link:
+            continue
+        val, url = _link_text("" if cell.value is None else str(cell.value), link)
         if url and sep not in val:
             cell.value = f"{val}{sep}{url}"
             changed += 1
-        else:
-            cell.value = val
-
-    wb.save(str(xlsx_path))
+    wb.save(str(dst_path))
     return changed
 
 
-def copy_to_sharepoint(processed_path: Path, sp_folder: Path) -> Path:
+def transform_workbook(xlsx_path: Path, dst_path: Path, start_row=19, col_b=2, sep=" ### "):
+    try:
+        return _rewrite_sheet_xml(xlsx_path, dst_path, start_row, col_b, sep)
+    except _UnsupportedLayout as e:
+        logging.info(f"Direct XML rewrite not possible ({e}); using openpyxl instead.")
+        return _transform_with_openpyxl(xlsx_path, dst_path, start_row, col_b, sep)
+
+
+def _copy_file(src: Path, dest: Path):
+    # Large files go through CopyFileExW unbuffered: they are written once
+    # for OneDrive to upload and never read back, so caching them is waste.
+    if os.name == "nt" and src.stat().st_size > UNBUFFERED_COPY_MIN:
+        if not _kernel32.CopyFileExW(str(src), str(dest), None, None, None,
+                                     COPY_FILE_NO_BUFFERING):
+            raise ctypes.WinError(ctypes.get_last_error())
+    else:
+        shutil.copy2(src, dest)
+
+
+def copy_to_sharepoint(processed_path: Path, sp_folder: Path, name=None) -> Path:
     sp_folder.mkdir(parents=True, exist_ok=True)
-    dest = sp_folder / processed_path.name
-    shutil.copy2(processed_path, dest)
+    dest = sp_folder / (name or processed_path.name)
+    _copy_file(processed_path, dest)
     return dest
 
 
-class NewFileHandler(FileSystemEventHandler):
+class NewFileHandler(PatternMatchingEventHandler):
     def __init__(self, cfg):
         self.cfg = cfg
         self.pattern = cfg.get("pattern", DEFAULT_WATCH_GLOB)
+        # watchdog drops non-matching paths before any on_* callback runs
+        super().__init__(patterns=[self.pattern], ignore_directories=True, case_sensitive=False)
+        self._pattern_re = re.compile(fnmatch.translate(self.pattern), re.IGNORECASE)
         self.start_row = int(cfg.get("start_row", DEFAULT_START_ROW))
         self.col_b = int(cfg.get("col_b", DEFAULT_COL_B))
         self.sep = cfg.get("separator", DEFAULT_SEPARATOR)
         self.sp_folder = Path(cfg["sharepoint_folder"]).resolve()
+        self._lock = threading.Lock()
+        self._pending = {}      # path -> threading.Timer
+        self._first_seen = {}   # path -> monotonic time of the burst's first event
+        self._settled = set()   # paths that saw a close/move event in this burst
+        self._in_flight = set()
+        self.last_event_ts = time.monotonic()
+        self._names_used = set()  # Processed_* names handed out, copied or not
+        self._copy_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sp-copy")
+        self._processed = self._load_processed()  # fingerprint -> Processed_* name
+        self._copying = set()  # fingerprints whose SharePoint copy is still running
 
     def _matches(self, name: str) -> bool:
-        return Path(name).match(self.pattern)
+        return self._pattern_re.match(name) is not None
 
-    def _process(self, path_str):
+    def _seen(self, key) -> bool:
+        with self._lock:
+            return key in self._processed or key in self._copying
+
+    def _candidate(self, path_str, stable_secs=5):
         try:
             p = Path(path_str)
-            if p.is_dir(): return
-            if not self._matches(p.name): return
+            if p.is_dir(): return None
+            if not self._matches(p.name): return None
 
             # Age check first
             if not is_file_fresh_enough(p, MAX_FILE_AGE_HOURS):
                 logging.info(f"Skipping old file (> {MAX_FILE_AGE_HOURS}h): {p}")
-                return
+                return None
+            if self._seen(self._fingerprint(p)):
+                logging.info(f"Already processed, skipping: {p}")
+                return None
 
             logging.info(f"Detected candidate: {p}")
-            if not is_file_stable(p, 5):
+            if not is_file_stable(p, stable_secs):
                 logging.warning(f"File not stable: {p}")
-                return
+                return None
+            return p
+        except Exception as e:
+            logging.exception(f"Error checking file: {path_str}: {e}")
+            return None
 
-            src = p
-            # Convert .xls -> .xlsx if needed
-            if src.suffix.lower() == ".xls":
-                if win32 is None:
-                    logging.error("Received .xls but Excel automation unavailable; skipping.")
-                    return
-                logging.info(f"Converting .xls to .xlsx using Excel: {src}")
-                src = excel_xls_to_xlsx(src, visible=False)
-                logging.info(f"Converted to: {src}")
+    def fresh_reports(self, folder: Path) -> list:
+        # Matching reports young enough to process and not already handled,
+        # via one scandir pass
+        cutoff = time.time() - MAX_FILE_AGE_HOURS * 3600
+        hits = []
+        with os.scandir(folder) as it:
+            for entry in it:
+                try:
+                    if not (self._matches(entry.name) and entry.is_file()):
+                        continue
+                    st = entry.stat()
+                    key = (str(Path(entry.path).resolve()), st.st_size, int(st.st_mtime))
+                except OSError:
+                    continue  # removed mid-scan
+                if st.st_mtime < cutoff:
+                    continue
+                if not self._seen(key):
+                    hits.append(entry.path)
+        return hits
+
+    def schedule_paths(self, paths):
+        # Queue reports found by a scan rather than a filesystem event
+        for path_str in paths:
+            self._schedule(path_str)
 
+    def _publish(self, src: Path, key=None):
+        try:
             if src.suffix.lower() != ".xlsx":
                 logging.warning(f"Unsupported extension {src.suffix}; skipping.")
                 return
 
-            logging.info(f"Transforming workbook: {src}")
-            changed = transform_workbook(src, self.start_row, self.col_b, self.sep)
-            logging.info(f"Transform complete; rows changed: {changed}")
+            processed_path = self._processed_path(src)
+            if _fast_has_urls(src):
+                logging.info(f"Transforming workbook: {src} -> {processed_path.name}")
+                changed = transform_workbook(src, processed_path, self.start_row, self.col_b, self.sep)
+                logging.info(f"Transform complete; rows changed: {changed}")
+                job = (copy_to_sharepoint, processed_path, self.sp_folder)
+            else:
+                logging.info(f"No hyperlinks or URLs in {src.name}; publishing it unchanged.")
+                job = (copy_to_sharepoint, src, self.sp_folder, processed_path.name)
 
-            stamp = datetime.now().strftime(DEFAULT_TS_FMT)
-            processed_name = f"Processed_{stamp}.xlsx"
-            processed_path = src.with_name(processed_name)
-            shutil.copy2(src, processed_path)
+            # Copy in the background so the next report isn't held up by OneDrive I/O;
+            # until it lands, events for the same file are treated as already processed
+            with self._lock:
+                self._copying.add(key)
+            self._copy_executor.submit(*job).add_done_callback(partial(self._on_copy_done, key))
 
-            dest = copy_to_sharepoint(processed_path, self.sp_folder)
-            logging.info(f"Copied to SharePoint folder (OneDrive will sync): {dest}")
+        except Exception as e:
+            logging.exception(f"Error processing file: {src}: {e}")
+            with self._lock:
+                self._copying.discard(key)
+
+    def _processed_path(self, src: Path) -> Path:
+        stamp = datetime.now().strftime(DEFAULT_TS_FMT)
+        name = f"Processed_{stamp}.xlsx"
+        n = 1
+        with self._lock:
+            # several reports in the same second
+            while (name in self._names_used or src.with_name(name).exists()
+                   or (self.sp_folder / name).exists()):
+                n += 1
+                name = f"Processed_{stamp}_{n}.xlsx"
+            self._names_used.add(name)
+        return src.with_name(name)
 
+    def _on_copy_done(self, key, future):
+        try:
+            dest = future.result()
         except Exception as e:
-            logging.exception(f"Error processing file: {path_str}: {e}")
+            logging.error(f"Copy to SharePoint folder failed: {e}", exc_info=e)
+        else:
+            logging.info(f"Copied to SharePoint folder (OneDrive will sync): {dest}")
+            if key is not None:
+                self._remember(key, dest.name)
+        with self._lock:
+            self._copying.discard(key)
+
+    @staticmethod
+    def _fingerprint(p: Path):
+        st = p.stat()
+        return (str(p.resolve()), st.st_size, int(st.st_mtime))
+
+    @staticmethod
+    def _load_processed():
+        try:
+            entries = read_json(PROCESSED_PATH)
+        except Exception:
+            entries = []
+        return OrderedDict((tuple(e[:3]), e[3]) for e in entries[-PROCESSED_CACHE_SIZE:])
+
+    def _remember(self, key, name):
+        # OneDrive re-touches files after upload; this stops those events
+        # from pushing the same report through Excel and SharePoint again.
+        with self._lock:
+            self._processed[key] = name
+            self._processed.move_to_end(key)
+            while len(self._processed) > PROCESSED_CACHE_SIZE:
+                self._processed.popitem(last=False)
+            try:
+                write_json(PROCESSED_PATH, [[*k, v] for k, v in self._processed.items()])
+            except Exception as e:
+                logging.warning(f"Could not save {PROCESSED_PATH}: {e}")
+
+    def close(self):
+        self._copy_executor.shutdown(wait=True)
+
+    def _process_batch(self, batch):
+        ready = [p for p in (self._candidate(path_str, 0 if settled else 5)
+                             for path_str, settled in batch) if p]
+
+        # Convert every .xls in the batch in a single Excel job / soffice run
+        xls = [p for p in ready if p.suffix.lower() == ".xls"]
+        converted = {}
+        pending = list(xls)
+        if pending and _get_win32() is not None:
+            logging.info(f"Converting {len(pending)} .xls file(s) to .xlsx using Excel")
+            try:
+                results = excel_xls_to_xlsx_batch(pending, visible=False)
+                converted.update((p, dst) for p, dst in zip(pending, results) if dst)
+            except Exception as e:
+                # pywin32 is bundled, so on a PC without Office this is where we land
+                logging.exception(f"Excel conversion failed: {e}")
+            pending = [p for p in pending if p not in converted]
+        if pending and _find_soffice():
+            logging.info(f"Converting {len(pending)} .xls file(s) to .xlsx using LibreOffice")
+            try:
+                converted.update(zip(pending, libreoffice_batch_convert(pending, pending[0].parent)))
+            except Exception as e:
+                logging.exception(f"LibreOffice conversion failed: {e}")
+        elif pending and _get_win32() is None:
+            logging.error("Received .xls but neither Excel nor LibreOffice is available; skipping.")
+
+        for p in ready:
+            src = converted.get(p) if p in xls else p
+            if src is None:
+                continue
+            if src is not p:
+                logging.info(f"Converted to: {src}")
+            try:
+                key = self._fingerprint(p)
+            except OSError:
+                key = None
+            self._publish(src, key)
+
+    def _schedule(self, path_str, settled=False):
+        # Coalesce event storms: (re)arm a per-path timer so the file is handled
+        # once the events go quiet, or DEBOUNCE_MAX_SECS after the first one.
+        if not self._matches(os.path.basename(path_str)): return
+        self.last_event_ts = time.monotonic()
+        with self._lock:
+            if path_str in self._in_flight:
+                return
+            now = time.monotonic()
+            first = self._first_seen.setdefault(path_str, now)
+            if settled:
+                self._settled.add(path_str)
+            old = self._pending.get(path_str)
+            if old:
+                old.cancel()
+            delay = max(0.0, min(DEBOUNCE_SECS, first + DEBOUNCE_MAX_SECS - now))
+            timer = threading.Timer(delay, self._fire, args=(path_str,))
+            timer.daemon = True
+            self._pending[path_str] = timer
+            timer.start()
+
+    def _fire(self, path_str):
+        with self._lock:
+            if self._pending.get(path_str) is not threading.current_thread():
+                return  # superseded by a later event
+            # Take everything that is pending so reports arriving together
+            # share one Excel session.
+            batch = []
+            for path, timer in self._pending.items():
+                if timer is not threading.current_thread():
+                    timer.cancel()
+                batch.append((path, path in self._settled))
+            self._pending.clear()
+            self._first_seen.clear()
+            self._settled.clear()
+            self._in_flight.update(path for path, _ in batch)
+        try:
+            self._process_batch(batch)
+        finally:
+            with self._lock:
+                self._in_flight.difference_update(path for path, _ in batch)
 
-    def on_created(self, event):  self._process(event.src_path)
-    def on_modified(self, event): self._process(event.src_path)
+    # On Linux the close-after-write event replaces created/modified polling;
+    # a rename into place (browser .crdownload -> .xls) is complete by definition.
+    def on_created(self, event):
+        if not CLOSE_EVENTS: self._schedule(event.src_path)
+    def on_modified(self, event):
+        if not CLOSE_EVENTS: self._schedule(event.src_path)
+    def on_closed(self, event): self._schedule(event.src_path, settled=True)
+    def on_moved(self, event):  self._schedule(event.dest_path, settled=True)
 
 
 def main():
@@ -326,13 +1010,43 @@ def main():
     observer.schedule(handler, str(watch_folder), recursive=False)
     observer.start()
     logging.info("Watcher is active. Close this window to stop.")
+    suspended = False
+    next_check = time.monotonic() + IDLE_POLL_SECS
     try:
         while True:
-            time.sleep(1)
+            time.sleep(IDLE_POLL_SECS if suspended else 1)
+            if not suspended:
+                if time.monotonic() < next_check:
+                    continue
+                next_check = time.monotonic() + IDLE_POLL_SECS
+                try:
+                    idle = (time.monotonic() - handler.last_event_ts > IDLE_SUSPEND_SECS
+                            and not handler.fresh_reports(watch_folder))
+                except OSError as e:
+                    logging.warning(f"Could not scan {watch_folder}: {e}")
+                    continue
+                if idle:
+                    observer.unschedule_all()
+                    suspended = True
+                    logging.info(f"No reports for {IDLE_SUSPEND_SECS // 60} min; "
+                                 f"pausing the watch and checking every {IDLE_POLL_SECS}s.")
+            else:
+                try:
+                    hits = handler.fresh_reports(watch_folder)
+                    if hits:
+                        observer.schedule(handler, str(watch_folder), recursive=False)
+                except OSError as e:
+                    logging.warning(f"Could not scan {watch_folder}: {e}")
+                    continue
+                if hits:
+                    suspended = False
+                    logging.info("New report found; resuming the watch.")
+                    handler.schedule_paths(hits)
     except KeyboardInterrupt:
         logging.info("Stopping watcher...")
         observer.stop()
     observer.join()
+    handler.close()
 
 
 if __name__ == "__main__":